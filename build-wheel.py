@@ -8,21 +8,134 @@ import os
 import sys
 import json
 import shutil
+import hashlib
+import io
+import mmap
+import zipfile
+import tarfile
 import platform
 import subprocess
 import datetime
-import glob
+import ctypes
+import re
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+# The host system never changes while the script runs, so look it up once
+_SYSTEM = platform.system()
+_IS_LINUX = _SYSTEM == "Linux"
+
+# Matches dotted version numbers such as 2.39 or 1.85.0 in probe output
+_VER_RE = re.compile(rb"(\d+(?:\.\d+)+)")
+
+# Seconds to wait for a version probe before giving up on it; generous because
+# a cold rustup proxy may first have to sync the toolchain from rust-toolchain.toml
+_PROBE_TIMEOUT = 60
+
+# Probe results are cached here between builds on the same machine
+_SYSINFO_CACHE_DIR = Path.home() / ".cache" / "veda-build"
+
+def _tool_mtime(name):
+    """Return the modification time of a tool on PATH, or 0 if it is missing."""
+    path = shutil.which(name)
+    if path is None:
+        return 0
+    return int(os.stat(path).st_mtime)
+
+def _sysinfo_cache_file():
+    """Get the cache file for the currently installed C toolchain."""
+    return _SYSINFO_CACHE_DIR / f"sysinfo-{_tool_mtime('gcc')}.json"
+
+def _probe_version(cmd):
+    """Run a version probe and extract the version from its first output line."""
+    result = subprocess.run(cmd, capture_output=True, check=True, timeout=_PROBE_TIMEOUT)
+    first = result.stdout.split(b"\n", 1)[0]
+    m = _VER_RE.search(first)
+    return {
+        "version": m.group(1).decode() if m else None,
+        "full": first.decode("utf-8", "replace").strip(),
+    }
+
+def _read_os_release():
+    """Read the key/value pairs from /etc/os-release."""
+    info = {}
+    try:
+        with open("/etc/os-release") as f:
+            for line in f:
+                if "=" in line:
+                    k, v = line.rstrip().split("=", 1)
+                    info[k] = v.strip('"')
+    except FileNotFoundError:
+        return {}
+    return info
+
+def _glibc_version():
+    """Get the glibc version straight from the C library."""
+    gnu_get_libc_version = ctypes.CDLL("libc.so.6").gnu_get_libc_version
+    gnu_get_libc_version.restype = ctypes.c_char_p
+    return gnu_get_libc_version().decode()
+
+def _run_probes(probes):
+    """Run version probes concurrently and return the results of those that succeeded."""
+    results = {}
+    with ThreadPoolExecutor(max_workers=len(probes)) as executor:
+        futures = {executor.submit(_probe_version, cmd): name for name, cmd in probes.items()}
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                results[name] = future.result()
+            except Exception as e:
+                print(f"Warning: Failed to get {name} version: {e}")
+    
+    return results
+
+def _get_probes():
+    """Get toolchain probe results, reusing the on-disk cache when possible.
+    
+    rustc is probed on every run: rustup can switch toolchains behind the same
+    proxy binary, so there is nothing reliable to key its cache entry on.
+    """
+    probes = {"rustc": ["rustc", "--version"]}
+    
+    cache_file = _sysinfo_cache_file()
+    try:
+        with open(cache_file) as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        cached = None
+        if _IS_LINUX:
+            probes["gcc"] = ["gcc", "--version"]
+    
+    results = _run_probes(probes)
+    if cached is not None:
+        results.update(cached)
+        return results
+    
+    results["processor"] = platform.processor()
+    
+    # Only cache complete results, so a failed probe is retried on the next run
+    if _IS_LINUX and "gcc" not in results:
+        return results
+    
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(cache_file, "w") as f:
+            json.dump({name: results[name] for name in ("processor", "gcc") if name in results}, f, indent=2)
+    except OSError as e:
+        print(f"Warning: Failed to cache system info: {e}")
+    
+    return results
 
 def get_system_info():
     """Get detailed information about the current system."""
+    probes = _get_probes()
     
     # Get basic platform info
     system_info = {
         "platform": {
-            "system": platform.system(),
+            "system": _SYSTEM,
             "machine": platform.machine(),
-            "processor": platform.processor(),
+            "processor": probes["processor"],
             "architecture": platform.architecture()[0],
         },
         "python": {
@@ -33,55 +146,33 @@ def get_system_info():
         "build_date": datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     }
     
-    # Linux-specific info
-    if platform.system() == "Linux":
-        try:
-            import distro
-            system_info["platform"]["distribution"] = distro.name(pretty=True)
-            system_info["platform"]["distro_id"] = distro.id()
-            system_info["platform"]["distro_version"] = distro.version()
-            system_info["platform"]["distro_codename"] = distro.codename()
-        except Exception as e:
-            print(f"Warning: Failed to get Linux distribution info: {e}")
-    
-    # Get glibc version on Linux
-    if platform.system() == "Linux":
+    # Linux-specific info: distribution, glibc and libstdc++ (gcc) versions
+    if _IS_LINUX:
+        os_rel = _read_os_release()
+        if os_rel:
+            system_info["platform"]["distribution"] = os_rel.get("PRETTY_NAME", "")
+            system_info["platform"]["distro_id"] = os_rel.get("ID", "linux")
+            system_info["platform"]["distro_version"] = os_rel.get("VERSION_ID", "")
+            system_info["platform"]["distro_codename"] = os_rel.get("VERSION_CODENAME", "")
+        else:
+            print("Warning: Failed to get Linux distribution info: /etc/os-release not found")
+        
         try:
-            glibc_version = subprocess.check_output("ldd --version | head -n 1", 
-                                                   shell=True, text=True)
-            if "glibc" in glibc_version.lower():
-                # Extract version number
-                parts = glibc_version.split()
-                for part in parts:
-                    if part[0].isdigit():
-                        system_info["platform"]["glibc_version"] = part
-                        break
-        except Exception as e:
+            system_info["platform"]["glibc_version"] = _glibc_version()
+        except (OSError, AttributeError) as e:
             print(f"Warning: Failed to get glibc version: {e}")
-    
-    # Get libstdc++ version if possible
-    if platform.system() == "Linux":
-        try:
-            gcc_version = subprocess.check_output("gcc --version | head -n 1", 
-                                                shell=True, text=True)
-            system_info["platform"]["gcc_version"] = gcc_version.strip()
-        except Exception as e:
-            print(f"Warning: Failed to get GCC version: {e}")
+        
+        if "gcc" in probes:
+            system_info["platform"]["gcc_version"] = probes["gcc"]
     
     # Get Rust info
-    try:
-        rust_version = subprocess.check_output("rustc --version", 
-                                             shell=True, text=True)
-        system_info["rust"] = rust_version.strip()
-    except Exception as e:
-        print(f"Warning: Failed to get Rust version: {e}")
-        system_info["rust"] = "unknown"
+    system_info["rust"] = probes.get("rustc", {"version": None, "full": "unknown"})
     
     return system_info
 
 def create_platform_dirname(system_info):
     """Create a directory name based on platform information."""
-    if platform.system() == "Linux":
+    if _IS_LINUX:
         distro_id = system_info["platform"].get("distro_id", "linux").lower()
         distro_version = system_info["platform"].get("distro_version", "")
         arch = system_info["platform"]["machine"]
@@ -94,6 +185,28 @@ def create_platform_dirname(system_info):
         machine = system_info["platform"]["machine"]
         return f"{system}-{machine}"
 
+# Directories that never contain build leftovers and are expensive to walk
+_SCAN_SKIP_DIRS = {"dist", "build", "venv", "target"}
+
+def _scan(path):
+    """Recursively remove __pycache__ directories and .pyc files under path."""
+    with os.scandir(path) as entries:
+        for entry in entries:
+            # Like glob's **, never enter hidden directories (.git, .tox, .venv, ...)
+            if entry.name.startswith(".") or entry.name in _SCAN_SKIP_DIRS:
+                continue
+            
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name == "__pycache__":
+                    print(f"Removing {entry.path}")
+                    shutil.rmtree(entry.path)
+                elif not os.path.exists(os.path.join(entry.path, "pyvenv.cfg")):
+                    # Virtual environments are left alone
+                    _scan(entry.path)
+            elif entry.is_file(follow_symlinks=False) and entry.name.endswith(".pyc"):
+                print(f"Removing {entry.path}")
+                os.remove(entry.path)
+
 def clean_build_files():
     """Clean temporary build files."""
     print("Cleaning up temporary build files...")
@@ -106,23 +219,109 @@ def clean_build_files():
     if os.path.exists("build"):
         shutil.rmtree("build")
     
-    # Clean egg-info directories
-    for egg_info in glob.glob("*.egg-info") + glob.glob("src/*.egg-info"):
-        if os.path.isdir(egg_info):
-            print(f"Removing {egg_info}")
-            shutil.rmtree(egg_info)
+    # Clean egg-info directories of this project only
+    for parent in (".", "src"):
+        if not os.path.isdir(parent):
+            continue
+        with os.scandir(parent) as entries:
+            for entry in entries:
+                if entry.name.endswith(".egg-info") and entry.is_dir(follow_symlinks=False):
+                    print(f"Removing {entry.path}")
+                    shutil.rmtree(entry.path)
+    
+    # Clean __pycache__ and .pyc files in a single pass
+    _scan(".")
+
+def copy_with_hash(src, dst):
+    """Copy a file and compute its SHA-256 digest without buffering it in Python."""
+    # copyfile() uses sendfile() on Linux, so the copy stays in the kernel
+    shutil.copyfile(src, dst)
+    
+    # Hash the freshly written copy straight from the page cache
+    with open(dst, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if hasattr(mmap, "MADV_SEQUENTIAL"):
+            mm.madvise(mmap.MADV_SEQUENTIAL)
+        return hashlib.sha256(mm).hexdigest()
+
+def wheel_contents(wheel_path):
+    """List the files packed in a wheel, reading only its zip directory."""
+    with zipfile.ZipFile(wheel_path) as z:
+        return sorted(z.namelist())
+
+def atomic_write(path, payload):
+    """Write bytes to a file via a temporary file and an atomic rename."""
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "wb", buffering=0) as f:
+        f.write(payload)
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+def write_msgpack_metadata(wheels_dir, metadata):
+    """Add wheel metadata to the platform's binary metadata.msgpack registry."""
+    try:
+        import msgpack
+    except ImportError:
+        print("Warning: msgpack is not installed, skipping binary metadata")
+        return None
+    
+    # One registry per platform directory, keyed by wheel file name
+    registry_file = wheels_dir / "metadata.msgpack"
+    try:
+        registry = msgpack.unpackb(registry_file.read_bytes())
+    except (OSError, ValueError):
+        registry = {}
     
-    # Clean __pycache__ directories
-    for pycache in glob.glob("**/__pycache__", recursive=True):
-        if os.path.isdir(pycache):
-            print(f"Removing {pycache}")
-            shutil.rmtree(pycache)
+    # Pick up wheels that so far only have JSON metadata
+    for json_file in wheels_dir.glob("*.json"):
+        if json_file.stem + ".whl" in registry:
+            continue
+        try:
+            with open(json_file) as f:
+                wheel_metadata = json.load(f)
+            registry.setdefault(wheel_metadata["wheel_file"], wheel_metadata)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Warning: Failed to read {json_file}: {e}")
     
-    # Clean .pyc files
-    for pyc in glob.glob("**/*.pyc", recursive=True):
-        if os.path.isfile(pyc):
-            print(f"Removing {pyc}")
-            os.remove(pyc)
+    registry[metadata["wheel_file"]] = metadata
+    atomic_write(registry_file, msgpack.packb(registry, use_bin_type=True))
+    return registry_file
+
+def _reset_tarinfo(tarinfo):
+    """Strip ownership and timestamps so identical inputs give identical archives."""
+    tarinfo.mtime = 0
+    tarinfo.uid = tarinfo.gid = 0
+    tarinfo.uname = tarinfo.gname = ""
+    return tarinfo
+
+def archive_platform_dir(wheels_dir, platform_dir, wheel_filename, sha256):
+    """Pack a platform directory into a single LZ4-compressed TAR artifact."""
+    try:
+        import lz4.frame
+    except ImportError:
+        print("Warning: lz4 is not installed, skipping platform archive")
+        return None
+    
+    archive_file = wheels_dir.parent / f"{platform_dir}.tar.lz4"
+    pt_meta = json.dumps({
+        "type": "python_wheel",
+        "format": "bdist_wheel",
+        "platform": platform_dir,
+        "wheel_file": wheel_filename,
+        "sha256": sha256,
+    }, indent=2, sort_keys=True).encode()
+    
+    with lz4.frame.open(archive_file, "wb", compression_level=0) as lz4f:
+        with tarfile.open(fileobj=lz4f, mode="w|") as tar:
+            # pt_meta.json goes first so readers can identify the artifact
+            tarinfo = _reset_tarinfo(tarfile.TarInfo("pt_meta.json"))
+            tarinfo.size = len(pt_meta)
+            tar.addfile(tarinfo, io.BytesIO(pt_meta))
+            
+            for path in sorted(wheels_dir.iterdir(), key=lambda p: p.name):
+                if path.is_file():
+                    tar.add(path, arcname=path.name, filter=_reset_tarinfo)
+    
+    return archive_file
 
 def build_wheel():
     """Build the wheel file and create metadata."""
@@ -154,19 +353,20 @@ def build_wheel():
     wheels_dir = Path("wheels") / platform_dir
     wheels_dir.mkdir(parents=True, exist_ok=True)
     
-    # Copy wheel file to platform directory
+    # Copy wheel file to platform directory, hashing it on the way
     dest_wheel = wheels_dir / wheel_filename
-    shutil.copy(wheel_file, dest_wheel)
+    sha256 = copy_with_hash(wheel_file, dest_wheel)
     
     # Create metadata file
     metadata = {
         "wheel_file": wheel_filename,
+        "sha256": sha256,
+        "size_bytes": dest_wheel.stat().st_size,
+        "wheel_contents": wheel_contents(dest_wheel),
         "system_info": system_info
     }
     
     metadata_file = wheels_dir / f"{wheel_filename[:-4]}.json"
-    with open(metadata_file, "w") as f:
-        json.dump(metadata, f, indent=2)
     
     # Create a simple platform info text file for human reading
     platform_info = [
@@ -177,7 +377,7 @@ def build_wheel():
     ]
     
     # Add Linux distribution info if available
-    if platform.system() == "Linux" and "distribution" in system_info["platform"]:
+    if _IS_LINUX and "distribution" in system_info["platform"]:
         platform_info.append(f"Distribution: {system_info['platform']['distribution']}")
         if "distro_version" in system_info["platform"]:
             platform_info.append(f"Version: {system_info['platform']['distro_version']}")
@@ -185,22 +385,36 @@ def build_wheel():
             platform_info.append(f"Codename: {system_info['platform']['distro_codename']}")
     
     platform_info.append(f"Python: {system_info['python']['implementation']} {system_info['python']['version']}")
-    platform_info.append(f"Rust: {system_info['rust']}")
+    platform_info.append(f"Rust: {system_info['rust']['full']}")
     
     # Extra info for Linux
-    if platform.system() == "Linux":
+    if _IS_LINUX:
         if "glibc_version" in system_info["platform"]:
             platform_info.append(f"glibc: {system_info['platform']['glibc_version']}")
         if "gcc_version" in system_info["platform"]:
-            platform_info.append(f"GCC: {system_info['platform']['gcc_version']}")
+            platform_info.append(f"GCC: {system_info['platform']['gcc_version']['full']}")
+    
+    # Write both metadata files atomically so a crash never leaves them torn
+    for path, payload in [
+        (metadata_file, json.dumps(metadata, indent=2).encode()),
+        (wheels_dir / "platform-info.txt", "\n".join(platform_info).encode()),
+    ]:
+        atomic_write(path, payload)
+    
+    # Binary copy of the metadata for fast registry lookups
+    msgpack_file = write_msgpack_metadata(wheels_dir, metadata)
     
-    with open(wheels_dir / "platform-info.txt", "w") as f:
-        f.write("\n".join(platform_info))
+    # Pack the platform directory into a single artifact
+    archive_file = archive_platform_dir(wheels_dir, platform_dir, wheel_filename, sha256)
     
     print(f"\nWheel build complete!")
     print(f"Wheel file: {dest_wheel}")
     print(f"Metadata: {metadata_file}")
     print(f"Platform info: {wheels_dir / 'platform-info.txt'}")
+    if msgpack_file:
+        print(f"Binary metadata: {msgpack_file}")
+    if archive_file:
+        print(f"Platform archive: {archive_file}")
     print(f"\nTo install this wheel, run:")
     print(f"pip install {dest_wheel}")
     
@@ -208,12 +422,4 @@ def build_wheel():
     clean_build_files()
 
 if __name__ == "__main__":
-    # Make sure the distro package is installed
-    try:
-        import distro
-    except ImportError:
-        print("Installing required package: distro")
-        subprocess.check_call([sys.executable, "-m", "pip", "install", "distro"])
-        import distro
-    
     build_wheel()
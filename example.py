@@ -1,7 +1,27 @@
 from vqueue import Queue, Consumer, Mode, MsgType
 import tempfile
-import os
 import json
+import os
+from multiprocessing import get_context
+
+def read_messages(consumer):
+    """Read and commit all available integer messages.
+    
+    Messages are read in batches of the consumer's get_batch_size(), and the
+    position is saved once per batch, when moving past its last message.
+    """
+    received = []
+    batch = consumer.get_batch_size()
+    while batch:
+        for i in range(batch):
+            if not consumer.pop_header():
+                return received
+            message = consumer.pop_body()
+            if message is not None:
+                received.append(int(message))
+            consumer.next(i == batch - 1)
+        batch = consumer.get_batch_size()
+    return received
 
 def test_queue_consumer_interaction():
     # Create a temporary directory for the queue
@@ -12,9 +32,7 @@ def test_queue_consumer_interaction():
         queue = Queue(base_path, queue_name, Mode.READ_WRITE)
         num_messages = 10
         
-        for i in range(num_messages):
-            msg = str(i).encode('utf-8')
-            queue.push(msg, MsgType.STRING)
+        queue.push_many([b"%d" % i for i in range(num_messages)], MsgType.STRING)
             
         print(f"Pushed {queue.count_pushed} messages")
         
@@ -22,12 +40,7 @@ def test_queue_consumer_interaction():
         consumer_name = "consumer1"
         consumer = Consumer(base_path, consumer_name, queue_name)
         
-        received_messages = []
-        while consumer.pop_header():
-            message = consumer.pop_body()
-            if message is not None:
-                received_messages.append(int(message.decode('utf-8')))
-                consumer.commit()
+        received_messages = read_messages(consumer)
                 
         print(f"Received {len(received_messages)} messages")
         print(f"Messages: {received_messages}")
@@ -35,6 +48,12 @@ def test_queue_consumer_interaction():
         # Verify message integrity
         assert len(received_messages) == num_messages
         assert received_messages == list(range(num_messages))
+        assert consumer.count_popped == queue.count_pushed
+        
+        # A consumer reopened under the same name continues after the saved position
+        del consumer
+        consumer = Consumer(base_path, consumer_name, queue_name)
+        assert read_messages(consumer) == [], "Reopened consumer read already committed messages"
         
         print("All messages received correctly")
 
@@ -45,27 +64,18 @@ def test_multiple_consumers():
         
         # Push some messages
         num_messages = 20
-        for i in range(num_messages):
-            msg = str(i).encode('utf-8')
-            queue.push(msg, MsgType.STRING)
+        queue.push_many([b"%d" % i for i in range(num_messages)], MsgType.STRING)
             
         # Create multiple consumers
         num_consumers = 3
         consumers = []
-        received_messages = []
         
         for i in range(num_consumers):
             consumer = Consumer(base_path, f"consumer{i}", queue_name)
             consumers.append(consumer)
-            received_messages.append([])
             
         # Each consumer reads all messages
-        for i, consumer in enumerate(consumers):
-            while consumer.pop_header():
-                message = consumer.pop_body()
-                if message is not None:
-                    received_messages[i].append(int(message.decode('utf-8')))
-                    consumer.commit()
+        received_messages = [read_messages(consumer) for consumer in consumers]
                     
         # Print results
         for i, messages in enumerate(received_messages):
@@ -75,6 +85,8 @@ def test_multiple_consumers():
         expected_messages = list(range(num_messages))
         for messages in received_messages:
             assert sorted(messages) == expected_messages, "Consumer did not receive all messages"
+        for consumer in consumers:
+            assert consumer.count_popped == queue.count_pushed
         
         print("All consumers received all messages correctly")
 
@@ -88,9 +100,7 @@ def test_queue_parts():
         queue1 = Queue(base_path, queue_name, Mode.READ_WRITE)
         num_messages_part1 = 5
         
-        for i in range(num_messages_part1):
-            msg = str(i).encode('utf-8')
-            queue1.push(msg, MsgType.STRING)
+        queue1.push_many([b"%d" % i for i in range(num_messages_part1)], MsgType.STRING)
         
         print(f"Part 1 created with {queue1.count_pushed} messages")
         
@@ -98,12 +108,7 @@ def test_queue_parts():
         consumer = Consumer(base_path, "consumer1", queue_name)
         
         # Read messages from part 1
-        messages_part1 = []
-        while consumer.pop_header():
-            message = consumer.pop_body()
-            if message is not None:
-                messages_part1.append(int(message.decode('utf-8')))
-                consumer.commit()
+        messages_part1 = read_messages(consumer)
         
         print(f"Read from part 1: {messages_part1}")
         assert len(messages_part1) == num_messages_part1
@@ -114,19 +119,15 @@ def test_queue_parts():
         queue2 = Queue(base_path, queue_name, Mode.READ_WRITE)
         num_messages_part2 = 7
         
-        for i in range(num_messages_part2):
-            msg = str(i + num_messages_part1).encode('utf-8')
-            queue2.push(msg, MsgType.STRING)
+        queue2.push_many(
+            [b"%d" % i for i in range(num_messages_part1, num_messages_part1 + num_messages_part2)],
+            MsgType.STRING,
+        )
             
         print(f"Part 2 created with {queue2.count_pushed} messages")
         
         # Existing consumer should read new messages from part 2
-        messages_part2 = []
-        while consumer.pop_header():
-            message = consumer.pop_body()
-            if message is not None:
-                messages_part2.append(int(message.decode('utf-8')))
-                consumer.commit()
+        messages_part2 = read_messages(consumer)
         
         print(f"Same consumer read from part 2: {messages_part2}")
         assert len(messages_part2) == num_messages_part2
@@ -135,13 +136,7 @@ def test_queue_parts():
         # Create new consumer
         print("\nReading with new consumer...")
         new_consumer = Consumer(base_path, "consumer2", queue_name)
-        all_messages = []
-        
-        while new_consumer.pop_header():
-            message = new_consumer.pop_body()
-            if message is not None:
-                all_messages.append(int(message.decode('utf-8')))
-                new_consumer.commit()
+        all_messages = read_messages(new_consumer)
         
         print(f"New consumer messages: {all_messages}")
         # New consumer should read messages from the current part
@@ -185,12 +180,9 @@ def test_individual_to_json_conversion():
                 print(f"Received binary data, length: {len(binary_data)} bytes")
                 
                 try:
-                    # Convert binary data to JSON using the static method
-                    json_str = Consumer.convert_individual_to_json(binary_data)
-                    print("Successfully converted Individual to JSON")
-                    
-                    # Parse JSON to Python object
-                    data = json.loads(json_str)
+                    # Convert binary data straight to a Python dict using the static method
+                    data = Consumer.convert_individual_to_dict(binary_data)
+                    print("Successfully converted Individual to dict")
                     
                     # Verify the content
                     assert "@" in data, "Missing URI in converted data"
@@ -231,11 +223,8 @@ def test_individual_to_json_conversion():
     
     try:
         # Convert directly without going through the queue
-        json_str = Consumer.convert_individual_to_json(direct_binary_data)
-        print("Successfully converted direct binary data to JSON")
-        
-        # Parse the JSON
-        data = json.loads(json_str)
+        data = Consumer.convert_individual_to_dict(direct_binary_data)
+        print("Successfully converted direct binary data to dict")
         
         # Verify the content
         assert "@" in data, "Missing URI in directly converted data"
@@ -243,6 +232,10 @@ def test_individual_to_json_conversion():
         assert "description" in data, "Missing 'description' predicate"
         assert "value" in data, "Missing 'value' predicate"
         
+        # The JSON string conversion yields the same structure as the dict conversion
+        assert json.loads(Consumer.convert_individual_to_json(direct_binary_data)) == data, \
+            "JSON and dict conversions differ"
+        
         print(f"Direct Individual URI: {data['@']}")
         print(f"Found {len(data) - 1} predicates")  # -1 for the '@' field
         print("Direct conversion test passed")
@@ -251,11 +244,19 @@ def test_individual_to_json_conversion():
         print(f"Error in direct conversion: {e}")
         assert False, f"Direct JSON conversion failed: {e}"
 
+def _run_test(test):
+    test()
+
 if __name__ == "__main__":
-    test_queue_consumer_interaction()
-    print("\n---\n")
-    test_multiple_consumers()
-    print("\n---\n")
-    test_queue_parts()
-    print("\n---\n")
-    test_individual_to_json_conversion()
+    # The tests share no state and each uses its own temporary directory,
+    # so they can run side by side in separate processes
+    tests = [
+        test_queue_consumer_interaction,
+        test_multiple_consumers,
+        test_queue_parts,
+        test_individual_to_json_conversion,
+    ]
+    
+    ctx = get_context("spawn")
+    with ctx.Pool(len(tests)) as pool:
+        pool.map(_run_test, tests)
@@ -8,100 +8,196 @@ import os
 import sys
 import json
 import platform
+import shutil
 import subprocess
+import functools
+import threading
+import types
 from pathlib import Path
-import argparse
 
+OS_RELEASE_FILE = "/etc/os-release"
+DEFAULT_GIT_URL = "https://github.com/ваша-организация/v-queue-python.git"
+WHEELS_DIR = Path("wheels")
+
+def _read_os_release():
+    """Read the distribution id and version from /etc/os-release."""
+    data = {}
+    with open(OS_RELEASE_FILE) as f:
+        for line in f:
+            key, sep, value = line.strip().partition("=")
+            if sep:
+                data[key] = value.strip('"')
+    return data.get("ID", "linux").lower(), data.get("VERSION_ID", "")
+
+def _detect_distro():
+    """Detect the distribution id and version without /etc/os-release."""
+    try:
+        import distro
+        return distro.id(), distro.version()
+    except ImportError:
+        pass
+    
+    try:
+        # Try to get distribution info using a single lsb_release call
+        result = subprocess.run(["lsb_release", "-sir"], capture_output=True, text=True, check=False)
+        distro_id, distro_version = result.stdout.split()[:2]
+        return distro_id.strip().lower(), distro_version.strip()
+    except:
+        print("Warning: Could not determine Linux distribution.")
+        return "linux", ""
+
+# Extra packages installed together with v-queue-python in the same pip run
+_extra_requirements = []
+
+@functools.lru_cache(maxsize=1)
 def get_current_system_info():
-    """Get basic information about the current system."""
+    """Get basic information about the current system.
+    
+    The result is computed once per process and returned as a read-only mapping.
+    """
     system_info = {
         "system": platform.system(),
         "machine": platform.machine(),
-        "python_version": platform.python_version(),
+        "python_version": (sys.version_info.major, sys.version_info.minor),
         "python_implementation": platform.python_implementation(),
     }
     
     # Get Linux distribution info if possible
     if platform.system() == "Linux":
         try:
-            import distro
-            system_info["distro_id"] = distro.id()
-            system_info["distro_version"] = distro.version()
-        except ImportError:
-            try:
-                # Try to get distribution info using lsb_release
-                distro_id = subprocess.check_output(["lsb_release", "-si"], text=True).strip().lower()
-                distro_version = subprocess.check_output(["lsb_release", "-sr"], text=True).strip()
-                system_info["distro_id"] = distro_id
-                system_info["distro_version"] = distro_version
-            except:
-                print("Warning: Could not determine Linux distribution.")
-                system_info["distro_id"] = "linux"
-                system_info["distro_version"] = ""
-    
-    return system_info
+            distro_id, distro_version = _read_os_release()
+        except OSError:
+            distro_id, distro_version = _detect_distro()
+        system_info["distro_id"] = distro_id
+        system_info["distro_version"] = distro_version
+    
+    return types.MappingProxyType(system_info)
+
+def _index_wheels(wheels_dir):
+    """Map each platform directory in wheels_dir to the wheel file names it contains."""
+    index = {}
+    with os.scandir(wheels_dir) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                with os.scandir(entry.path) as files:
+                    index[entry.name] = sorted(f.name for f in files if f.name.endswith(".whl"))
+    return index
+
+# Wheels directory indexes, keyed by resolved path and modification time
+_WHEELS_INDEX_CACHE = {}
+
+def _get_wheels_index(wheels_dir):
+    """Get the wheels directory index, scanning the directory only once per process."""
+    key = (str(wheels_dir.resolve()), wheels_dir.stat().st_mtime_ns)
+    index = _WHEELS_INDEX_CACHE.get(key)
+    if index is None:
+        index = _WHEELS_INDEX_CACHE[key] = _index_wheels(wheels_dir)
+    return index
+
+def _prefetch_wheels_index(wheels_dir):
+    """Fill the wheels index cache; problems are reported later by find_best_wheel."""
+    try:
+        _get_wheels_index(wheels_dir)
+    except OSError:
+        pass
+
+# Messages for the less exact Linux matches, keyed by match rank
+_LINUX_MATCH_MESSAGES = {
+    1: "Warning: Found wheel with different Python version: {wheel}",
+    2: "Found wheel for similar platform: {dir}",
+    3: "Warning: Found wheel for similar platform with different Python version: {wheel}",
+    4: "Found generic Linux wheel: {wheel}",
+}
 
 def find_best_wheel(system_info):
-    """Find the best matching wheel file for the current system."""
-    wheels_dir = Path("wheels")
+    """Find the best matching wheel file for the current system.
+    
+    Every platform directory gets a score: 0 for an exact platform match,
+    1 for the same Linux distribution, 2 for the same system and machine.
+    Within a score, a wheel for the current Python version beats any other
+    wheel, and the best ranked wheel over a single pass is returned.
+    """
+    wheels_dir = WHEELS_DIR
     
-    if not wheels_dir.exists() or not wheels_dir.is_dir():
+    if not wheels_dir.is_dir():
         print("No wheels directory found.")
         return None
     
     # Map Python version to ABI tag
-    py_version = "".join(system_info["python_version"].split(".")[:2])
-    py_tag = f"cp{py_version}"
+    py_tag = f"cp{system_info['python_version'][0]}{system_info['python_version'][1]}"
+    machine = system_info["machine"]
+    system = system_info["system"].lower()
+    is_linux = system_info["system"] == "Linux"
+    
+    def _match_strict(name):
+        # Same as the "*{py_tag}*{py_tag}*.whl" glob: the tag appears as both python and ABI tag
+        first = name.find(py_tag)
+        return first != -1 and name.find(py_tag, first + len(py_tag)) != -1
     
     # Create platform pattern
-    if system_info["system"] == "Linux":
+    if is_linux:
         distro_id = system_info.get("distro_id", "").lower()
         distro_version = system_info.get("distro_version", "")
-        platform_pattern = f"{distro_id}{distro_version}-{system_info['machine']}"
+        platform_pattern = f"{distro_id}{distro_version}-{machine}"
+    
+    best_rank, best_dir, best_wheel = None, None, None
+    for dir_name, wheels in _get_wheels_index(wheels_dir).items():
+        if not wheels:
+            continue
         
-        # Look for exact match first
-        exact_match_dir = wheels_dir / platform_pattern
-        if exact_match_dir.exists() and exact_match_dir.is_dir():
-            # Look for matching Python version
-            for wheel_file in exact_match_dir.glob(f"*{py_tag}*{py_tag}*.whl"):
-                return wheel_file
-            
-            # If no matching Python version, get any wheel
-            for wheel_file in exact_match_dir.glob("*.whl"):
-                print(f"Warning: Found wheel with different Python version: {wheel_file.name}")
-                return wheel_file
+        dir_lower = dir_name.lower()
+        if is_linux and dir_name == platform_pattern:
+            score = 0
+        elif is_linux and distro_id in dir_lower:
+            score = 1
+        elif system in dir_lower and machine in dir_name:
+            score = 2
+        else:
+            continue
         
-        # Try to find similar distribution
-        for dir_path in wheels_dir.iterdir():
-            if dir_path.is_dir() and distro_id in dir_path.name.lower():
-                # Found similar distro, check for matching Python version
-                for wheel_file in dir_path.glob(f"*{py_tag}*{py_tag}*.whl"):
-                    print(f"Found wheel for similar platform: {dir_path.name}")
-                    return wheel_file
-                
-                # If no matching Python version, get any wheel
-                for wheel_file in dir_path.glob("*.whl"):
-                    print(f"Warning: Found wheel for similar platform with different Python version: {wheel_file.name}")
-                    return wheel_file
+        # Prefer a wheel for the current Python version within the same score
+        wheel_name = next((w for w in wheels if _match_strict(w)), None)
+        rank = score * 2
+        if wheel_name is None:
+            wheel_name = wheels[0]
+            rank += 1
         
-        # If no specific distro match, look for generic linux
-        for dir_path in wheels_dir.iterdir():
-            if dir_path.is_dir() and "linux" in dir_path.name.lower() and system_info["machine"] in dir_path.name:
-                for wheel_file in dir_path.glob(f"*{py_tag}*{py_tag}*.whl"):
-                    print(f"Found generic Linux wheel: {wheel_file.name}")
-                    return wheel_file
+        if best_rank is None or rank < best_rank:
+            best_rank, best_dir, best_wheel = rank, dir_name, wheel_name
+            if rank == 0:
+                break
+    
+    if best_rank is None:
+        return None
+    
+    if is_linux and best_rank in _LINUX_MATCH_MESSAGES:
+        print(_LINUX_MATCH_MESSAGES[best_rank].format(dir=best_dir, wheel=best_wheel))
+    
+    return wheels_dir / best_dir / best_wheel
+
+def run_pip(args, isolated=False):
+    """Run pip with the given arguments.
     
-    # For non-Linux or fallback
-    for dir_path in wheels_dir.iterdir():
-        if dir_path.is_dir() and system_info["system"].lower() in dir_path.name.lower() and system_info["machine"] in dir_path.name:
-            for wheel_file in dir_path.glob("*.whl"):
-                return wheel_file
+    pip runs inside the current interpreter to avoid starting a second Python
+    for every install; pass isolated=True to run it in a subprocess instead.
+    """
+    if not isolated:
+        try:
+            from pip._internal.cli.main import main as pip_main
+        except ImportError:
+            isolated = True
     
-    return None
+    if isolated:
+        subprocess.check_call([sys.executable, "-m", "pip"] + args)
+        return
+    
+    status = pip_main(args)
+    if status:
+        raise subprocess.CalledProcessError(status, ["pip"] + args)
 
 def install_wheel(wheel_path, force=False, verbose=False):
     """Install the specified wheel file."""
-    cmd = [sys.executable, "-m", "pip", "install"]
+    cmd = ["install"]
     
     if force:
         cmd.append("--force-reinstall")
@@ -109,47 +205,79 @@ def install_wheel(wheel_path, force=False, verbose=False):
     if verbose:
         cmd.append("-v")
     
+    cmd.extend(_extra_requirements)
     cmd.append(str(wheel_path))
     
     print(f"Installing wheel: {wheel_path}")
-    subprocess.check_call(cmd)
+    run_pip(cmd)
 
 def install_from_source(verbose=False):
     """Install package from source."""
-    cmd = [sys.executable, "-m", "pip", "install", "."]
+    cmd = ["install"] + _extra_requirements + ["."]
     
     if verbose:
         cmd.append("-v")
     
     print("No suitable wheel found. Installing from source...")
-    subprocess.check_call(cmd)
+    run_pip(cmd)
 
-def install_from_git(git_url, verbose=False):
-    """Install package from git repository."""
-    cmd = [sys.executable, "-m", "pip", "install", git_url]
+def install_from_git(git_url, verbose=False, with_deps=False):
+    """Install package from git repository.
+    
+    The build reuses the current environment instead of an isolated one, and
+    dependencies are only resolved when with_deps is set.
+    """
+    cmd = ["install", "--no-build-isolation"]
+    
+    if not with_deps:
+        cmd.append("--no-deps")
+    
+    cmd.extend(_extra_requirements)
+    cmd.append(git_url)
     
     if verbose:
         cmd.append("-v")
     
     print(f"Installing from git: {git_url}")
-    subprocess.check_call(cmd)
+    run_pip(cmd)
 
-def main():
+def parse_args(argv):
+    """Parse command line arguments.
+    
+    The common invocations (no arguments, or just --git) are handled without
+    building an argparse parser; argparse is only imported for anything else.
+    """
+    if not argv or argv == ["--git"]:
+        return types.SimpleNamespace(
+            force=False,
+            source=False,
+            git=bool(argv),
+            git_url=DEFAULT_GIT_URL,
+            with_deps=False,
+            verbose=False,
+        )
+    
+    import argparse
+    
     parser = argparse.ArgumentParser(description="Install v-queue-python package")
     parser.add_argument("--force", action="store_true", help="Force reinstall")
     parser.add_argument("--source", action="store_true", help="Install from source even if wheel exists")
-    parser.add_argument("--git", action="store_true", help="Install from git repository")
-    parser.add_argument("--git-url", default="https://github.com/ваша-организация/v-queue-python.git", 
+    parser.add_argument("--git", action="store_true", help="Install from git repository if no suitable wheel is found")
+    parser.add_argument("--git-url", default=DEFAULT_GIT_URL, 
                         help="Git repository URL")
+    parser.add_argument("--with-deps", action="store_true", help="Resolve dependencies when installing from git")
     parser.add_argument("--verbose", "-v", action="store_true", help="Verbose output")
     
-    args = parser.parse_args()
-    
-    if args.git:
-        install_from_git(args.git_url, verbose=args.verbose)
-        return
+    return parser.parse_args(argv)
+
+def main():
+    args = parse_args(sys.argv[1:])
     
     if not args.source:
+        # Scan the wheels directory while the system info is being collected
+        prefetch = threading.Thread(target=_prefetch_wheels_index, args=(WHEELS_DIR,), daemon=True)
+        prefetch.start()
+        
         # Try to find suitable wheel
         system_info = get_current_system_info()
         if args.verbose:
@@ -157,6 +285,7 @@ def main():
             for key, value in system_info.items():
                 print(f"  {key}: {value}")
         
+        prefetch.join()
         wheel_path = find_best_wheel(system_info)
         
         if wheel_path:
@@ -165,23 +294,30 @@ def main():
             
             # Print platform info if available
             platform_info = wheel_path.parent / "platform-info.txt"
-            if platform_info.exists():
+            if args.verbose and platform_info.exists():
                 print("\nWheel platform information:")
-                print(platform_info.read_text())
+                sys.stdout.flush()
+                with platform_info.open("rb") as f:
+                    shutil.copyfileobj(f, sys.stdout.buffer)
+                print()
             
             return
     
+    # Only clone and build from git when no local wheel can be used
+    if args.git:
+        install_from_git(args.git_url, verbose=args.verbose, with_deps=args.with_deps)
+        return
+    
     # No wheel found or source installation requested
     install_from_source(verbose=args.verbose)
 
 if __name__ == "__main__":
-    # Check if distro package is installed
-    try:
-        import distro
-    except ImportError:
-        # Only try to install distro if we're on Linux
-        if platform.system() == "Linux":
-            print("Installing required package: distro")
-            subprocess.check_call([sys.executable, "-m", "pip", "install", "distro"])
+    # distro is only needed on Linux systems without /etc/os-release
+    if platform.system() == "Linux" and not os.path.exists(OS_RELEASE_FILE):
+        try:
+            import distro
+        except ImportError:
+            # Install it in the same pip run as the package itself
+            _extra_requirements.append("distro")
     
     main()
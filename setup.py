@@ -1,30 +1,56 @@
 from setuptools import setup
-from setuptools_rust import Binding, RustExtension
-import os
+from pathlib import Path
+import functools
 import sys
 
 # Добавляем версию в одном месте для удобного обновления
 VERSION = "0.1.2"
 PACKAGE_NAME = "v-queue-python"
 
+# Команды, которым нужно собирать Rust-расширение
+BUILD_COMMANDS = {
+    "build", "build_ext", "build_rust", "bdist_wheel",
+    "develop", "editable_wheel", "install", "egg_info",
+}
+
+# setuptools_rust нужен только для сборки, запросы метаданных
+# (python setup.py --name, --version) обходятся без него
+IS_BUILD = bool(BUILD_COMMANDS.intersection(sys.argv[1:]))
+
+
+def _rust_extensions():
+    if not IS_BUILD:
+        return []
+
+    from setuptools_rust import Binding, RustExtension
+
+    return [
+        RustExtension(
+            "vqueue", 
+            path="Cargo.toml",
+            binding=Binding.PyO3
+        )
+    ]
+
+
+@functools.lru_cache(maxsize=1)
+def _long_description():
+    readme = Path(__file__).with_name("README.md")
+    return readme.read_text(encoding="utf-8") if readme.exists() else ""
+
+
 setup(
     name=PACKAGE_NAME,
     version=VERSION,
     packages=[],
     description="Python bindings for v-queue with support for Individual model",
-    long_description=open("README.md").read() if os.path.exists("README.md") else "",
+    long_description=_long_description(),
     long_description_content_type="text/markdown",
     author="Your Name",
     author_email="your.email@example.com",
     url="https://github.com/ваша-организация/v-queue-python",
-    rust_extensions=[
-        RustExtension(
-            "vqueue", 
-            path="Cargo.toml",
-            binding=Binding.PyO3
-        )
-    ],
-    setup_requires=["setuptools-rust"],
+    rust_extensions=_rust_extensions(),
+    setup_requires=["setuptools-rust"] if IS_BUILD else [],
     install_requires=[],
     python_requires=">=3.7",
     classifiers=[
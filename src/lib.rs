@@ -5,8 +5,9 @@ use v_queue::record::MsgType;
 use v_queue::record::Mode;
 use pyo3::prelude::*;
 use pyo3::exceptions::PyValueError;
-use pyo3::types::PyBytes;
-use pyo3::PyObject;
+use pyo3::types::{PyBytes, PyDict, PyList};
+use pyo3::{IntoPyObjectExt, PyObject};
+use serde_json::Value;
 
 // Import from external library
 use v_individual_model::onto::individual::{Individual, RawObj};
@@ -97,6 +98,25 @@ impl PyQueue {
         }
     }
 
+    /// Pushes a list of messages of the same type in a single call
+    /// Returns the number of messages pushed
+    /// The batch is not atomic: messages before a failed one stay in the queue
+    fn push_many<'py>(&mut self, messages: Vec<Bound<'py, PyBytes>>, msg_type: PyMsgType) -> PyResult<usize> {
+        for (index, msg) in messages.iter().enumerate() {
+            if let Err(e) = self.inner.push(msg.as_bytes(), msg_type.into()) {
+                return Err(PyValueError::new_err(format!(
+                    "{} (message {} of {}, {} pushed)",
+                    e.as_str(),
+                    index,
+                    messages.len(),
+                    index
+                )));
+            }
+        }
+
+        Ok(messages.len())
+    }
+
     #[getter]
     fn count_pushed(&self) -> u32 {
         self.inner.count_pushed
@@ -163,20 +183,7 @@ impl PyConsumer {
     /// This is a static method that can be used independently of queue operations
     #[staticmethod]
     fn convert_individual_to_json(py: Python<'_>, binary_data: PyObject) -> PyResult<String> {
-        // Convert PyObject to bytes
-        let bytes = py_to_bytes(py, binary_data)?;
-
-        // Create Individual from binary data
-        let raw = RawObj::new(bytes);
-        let mut individual = Individual::new_raw(raw);
-
-        // Parse the raw data (initial parsing)
-        if let Err(_) = parse_raw(&mut individual) {
-            return Err(PyValueError::new_err("Failed to parse binary data to Individual"));
-        }
-
-        // Fully parse all predicates and resources (Individual uses lazy parsing)
-        individual.parse_all();
+        let mut individual = parse_individual(py, binary_data)?;
 
         // Convert Individual to JSON
         let json_str = individual.get_obj().as_json_str();
@@ -188,6 +195,22 @@ impl PyConsumer {
         Ok(json_str)
     }
 
+    /// Converts binary data in Individual format to a Python dict
+    /// Builds the Python objects directly, without producing an intermediate JSON string
+    #[staticmethod]
+    fn convert_individual_to_dict(py: Python<'_>, binary_data: PyObject) -> PyResult<PyObject> {
+        let mut individual = parse_individual(py, binary_data)?;
+
+        json_to_py(py, &individual.get_obj().as_json())
+    }
+
+    /// Moves past the current message, saving the position only if commit is true
+    /// Use next(true) on the last message of a batch to save the position of the whole batch
+    #[pyo3(signature = (commit=false))]
+    fn next(&mut self, commit: bool) -> bool {
+        self.inner.next(commit)
+    }
+
     fn commit(&mut self) -> bool {
         self.inner.commit()
     }
@@ -220,6 +243,58 @@ fn py_to_bytes(py: Python<'_>, obj: PyObject) -> PyResult<Vec<u8>> {
     }
 }
 
+/// Helper function to fully parse binary data into an Individual
+fn parse_individual(py: Python<'_>, binary_data: PyObject) -> PyResult<Individual> {
+    // Convert PyObject to bytes
+    let bytes = py_to_bytes(py, binary_data)?;
+
+    // Create Individual from binary data
+    let raw = RawObj::new(bytes);
+    let mut individual = Individual::new_raw(raw);
+
+    // Parse the raw data (initial parsing)
+    if let Err(_) = parse_raw(&mut individual) {
+        return Err(PyValueError::new_err("Failed to parse binary data to Individual"));
+    }
+
+    // Fully parse all predicates and resources (Individual uses lazy parsing)
+    individual.parse_all();
+
+    Ok(individual)
+}
+
+/// Helper function to convert a JSON value to native Python objects
+fn json_to_py(py: Python<'_>, value: &Value) -> PyResult<PyObject> {
+    match value {
+        Value::Null => Ok(py.None()),
+        Value::Bool(b) => b.into_py_any(py),
+        Value::Number(n) => {
+            if let Some(i) = n.as_i64() {
+                i.into_py_any(py)
+            } else if let Some(u) = n.as_u64() {
+                u.into_py_any(py)
+            } else {
+                n.as_f64().unwrap_or(f64::NAN).into_py_any(py)
+            }
+        },
+        Value::String(s) => s.as_str().into_py_any(py),
+        Value::Array(items) => {
+            let list = PyList::empty(py);
+            for item in items {
+                list.append(json_to_py(py, item)?)?;
+            }
+            list.into_py_any(py)
+        },
+        Value::Object(map) => {
+            let dict = PyDict::new(py);
+            for (key, item) in map {
+                dict.set_item(key, json_to_py(py, item)?)?;
+            }
+            dict.into_py_any(py)
+        },
+    }
+}
+
 /// Python module initialization
 #[pymodule]
 fn vqueue(py: Python<'_>, m: &Bound<'_, PyModule>) -> PyResult<()> {
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Loader for the metadata of the pre-compiled wheels in the wheels/ directory.
+Reads the binary metadata.msgpack registry of each platform directory and
+adds the wheels that only have JSON metadata files.
+"""
+
+import os
+import sys
+import json
+
+REGISTRY_FILE = "metadata.msgpack"
+
+def _load_msgpack(platform_path):
+    """Load the binary metadata registry of a platform directory."""
+    try:
+        import msgpack
+    except ImportError:
+        return None
+    
+    try:
+        with open(os.path.join(platform_path, REGISTRY_FILE), "rb") as f:
+            return msgpack.unpackb(f.read())
+    except (OSError, ValueError):
+        return None
+
+def _load_json(platform_path, known=()):
+    """Load the JSON metadata files of a platform directory.
+    
+    Files for wheels already in known are skipped without being read.
+    """
+    registry = {}
+    with os.scandir(platform_path) as entries:
+        for entry in entries:
+            if not entry.name.endswith(".json"):
+                continue
+            if entry.name[:-len(".json")] + ".whl" in known:
+                continue
+            try:
+                with open(entry.path) as f:
+                    metadata = json.load(f)
+                registry[metadata["wheel_file"]] = metadata
+            except (OSError, ValueError, KeyError) as e:
+                print(f"Warning: Failed to read {entry.path}: {e}")
+    return registry
+
+def load_registry(wheels_dir="wheels"):
+    """Map each platform directory to the metadata of its wheels, keyed by wheel file name."""
+    registry = {}
+    with os.scandir(wheels_dir) as entries:
+        for entry in entries:
+            if not entry.is_dir(follow_symlinks=False):
+                continue
+            
+            # Wheels built without msgpack only have JSON metadata
+            metadata = _load_msgpack(entry.path) or {}
+            for wheel_file, wheel_metadata in _load_json(entry.path, known=metadata).items():
+                metadata.setdefault(wheel_file, wheel_metadata)
+            if metadata:
+                registry[entry.name] = metadata
+    return registry
+
+if __name__ == "__main__":
+    wheels_dir = sys.argv[1] if len(sys.argv) > 1 else "wheels"
+    for platform_dir, wheels in sorted(load_registry(wheels_dir).items()):
+        print(f"{platform_dir}:")
+        for wheel_file in sorted(wheels):
+            print(f"  {wheel_file}")